@@ -1,9 +1,56 @@
 """Persistence utilities for reading and writing JSON data files."""
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Dict, Tuple
+
+try:  # orjson is optional; it is considerably faster on large repertoires
+    import orjson
+except ImportError:
+    orjson = None
+
+# Digest, mtime and size of the bytes this process last read from or wrote to
+# each path, so saving identical data again can skip the write.
+_known_contents: Dict[Path, Tuple[bytes, int, int]] = {}
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _remember(path: Path, digest: bytes) -> None:
+    stat = path.stat()
+    _known_contents[path] = (digest, stat.st_mtime_ns, stat.st_size)
+
+
+def _is_unchanged(path: Path, digest: bytes) -> bool:
+    known = _known_contents.get(path)
+    if known is None or known[0] != digest:
+        return False
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    return (stat.st_mtime_ns, stat.st_size) == known[1:]
+
+
+class _HashingWriter:
+    """Text sink for ``json.dump`` that hashes and forwards the encoded chunks."""
+
+    def __init__(self, fh: BinaryIO) -> None:
+        self._fh = fh
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def write(self, text: str) -> None:
+        chunk = text.encode("utf-8")
+        self._hash.update(chunk)
+        self._fh.write(chunk)
+
+    def digest(self) -> bytes:
+        return self._hash.digest()
 
 
 def load_json(path: Path) -> Any:
@@ -16,12 +63,49 @@ def load_json(path: Path) -> Any:
     path.parent.mkdir(parents=True, exist_ok=True)
     if not path.exists():
         path.write_text("{}", encoding="utf-8")
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    payload = path.read_bytes()
+    _remember(path, _digest(payload))
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
 
 
 def save_json(path: Path, data: Any) -> None:
-    """Write JSON ``data`` to ``path`` with UTF-8 encoding."""
+    """Write JSON ``data`` to ``path`` with UTF-8 encoding.
+
+    The file is replaced atomically so a crash mid-write cannot leave it
+    truncated, and the write is skipped entirely when the file still holds
+    exactly the bytes that would be written.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2, sort_keys=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+        digest = _digest(payload)
+        if _is_unchanged(path, digest):
+            return
+    try:
+        if orjson is not None:
+            with tmp_path.open("wb") as fh:
+                fh.write(payload)
+                fh.flush()
+                os.fsync(fh.fileno())
+        else:
+            # Stream the stdlib encoder into the file rather than building one large string
+            with tmp_path.open("wb", buffering=1 << 20) as fh:
+                writer = _HashingWriter(fh)
+                json.dump(data, writer, indent=2, sort_keys=True)
+                fh.flush()
+                digest = writer.digest()
+                unchanged = _is_unchanged(path, digest)
+                if not unchanged:
+                    os.fsync(fh.fileno())
+            if unchanged:
+                tmp_path.unlink()
+                return
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a half-written temporary file next to the target
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _remember(path, digest)
@@ -1,16 +1,168 @@
 """Repertoire management utilities."""
 from __future__ import annotations
 
+import logging
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Union
 
 import chess
 import chess.pgn
 
 from .persistence import load_json, save_json
 
+LOGGER = logging.getLogger(__name__)
+
 RepertoireTree = Dict[str, Dict[str, str]]
 
+# Files written by RepertoireManager.save carry this tag and can be trusted as-is.
+# Version 2 keys positions by EPD (FEN without the move clocks).
+SCHEMA_KEY = "__schema__"
+SCHEMA_VERSION = 2
+
+
+def position_key(fen: str) -> str:
+    """Return the repertoire key for ``fen``: the FEN without its move clocks.
+
+    Clocks are irrelevant for opening trees and would otherwise split
+    transpositions into separate nodes. EPD input is returned unchanged.
+    """
+    return " ".join(fen.split(" ")[:4])
+
+
+def _read_tree(path: Path) -> Tuple[RepertoireTree, bool]:
+    """Return the tree stored at ``path`` and whether it was migrated from an older format."""
+    raw = load_json(path)
+    if not isinstance(raw, dict) or not raw:
+        return {}, False
+    schema = raw.get(SCHEMA_KEY)
+    if schema == SCHEMA_VERSION and isinstance(raw.get("tree"), dict):
+        # Written by our own save(), skip the per-move validation. Keys are still
+        # interned so they share one string object with the SRS card keys.
+        return {sys.intern(fen): moves for fen, moves in raw["tree"].items()}, False
+    # Older or untagged file: keep only well-formed entries and rekey by EPD
+    if schema is not None:
+        raw = raw.get("tree")
+        if not isinstance(raw, dict):
+            return {}, True
+    tree: RepertoireTree = {}
+    for fen, moves in raw.items():
+        if not isinstance(fen, str) or not isinstance(moves, dict):
+            continue
+        node = tree.setdefault(sys.intern(position_key(fen)), {})
+        for move, next_fen in moves.items():
+            if isinstance(move, str) and isinstance(next_fen, str):
+                node[move] = sys.intern(position_key(next_fen))
+    return tree, True
+
+
+def _write_tree(path: Path, tree: RepertoireTree) -> None:
+    save_json(path, {SCHEMA_KEY: SCHEMA_VERSION, "tree": tree})
+
+
+def _rank_fen(board: chess.Board, rank: int) -> str:
+    """Return the FEN placement field for a single ``rank`` of ``board``."""
+    parts = []
+    empty = 0
+    for file in range(8):
+        piece = board.piece_at(chess.square(file, rank))
+        if piece is None:
+            empty += 1
+            continue
+        if empty:
+            parts.append(str(empty))
+            empty = 0
+        parts.append(piece.symbol())
+    if empty:
+        parts.append(str(empty))
+    return "".join(parts)
+
+
+def _epd_suffix(board: chess.Board) -> str:
+    """Return the side to move, castling and en passant fields of ``board.epd()``."""
+    ep_square = board.ep_square if board.has_legal_en_passant() else None
+    return " ".join(
+        (
+            "w" if board.turn == chess.WHITE else "b",
+            board.castling_xfen(),
+            chess.SQUARE_NAMES[ep_square] if ep_square is not None else "-",
+        )
+    )
+
+
+class _RepertoireVisitor(chess.pgn.BaseVisitor[bool]):
+    """Record one side's moves straight from the PGN reader.
+
+    Unlike the default ``GameBuilder`` no ``Game`` node graph is built, so
+    comments, NAGs and nodes are never materialised. Variations are still
+    followed because the reader keeps its own board stack for them.
+
+    Position keys are maintained incrementally: a move only changes the ranks
+    of its from- and to-squares (castling rooks and en passant captures stay on
+    those ranks), so only those two ranks are re-read after each move instead
+    of serialising the whole board twice per recorded move.
+
+    After a parse error the rest of the game is ignored: python-chess abandons
+    the variation but keeps its board on the stack, so later moves would be
+    recorded from positions that never occur.
+    """
+
+    def __init__(self, tree: RepertoireTree, color: chess.Color) -> None:
+        self._tree = tree
+        self._color = color
+        # Placement of the reader's current board, rank 1 first; None when unknown
+        self._ranks: Optional[List[str]] = None
+        self._move: Optional[chess.Move] = None
+        self._fen_before: Optional[str] = None
+        self._san_move = ""
+        self._abandoned = False
+
+    def _key(self, ranks: List[str], board: chess.Board) -> str:
+        return "/".join(reversed(ranks)) + " " + _epd_suffix(board)
+
+    def begin_variation(self) -> Optional[chess.pgn.SkipType]:
+        if self._abandoned:
+            return chess.pgn.SKIP
+        # The reader jumps back to an earlier board; rebuild the ranks on the next move
+        self._ranks = None
+        return None
+
+    def end_variation(self) -> None:
+        self._ranks = None
+
+    def begin_parse_san(self, board: chess.Board, san: str) -> Optional[chess.pgn.SkipType]:
+        return chess.pgn.SKIP if self._abandoned else None
+
+    def visit_move(self, board: chess.Board, move: chess.Move) -> None:
+        # ``board`` is the position before ``move``; visit_board() follows the push
+        if self._ranks is None:
+            self._ranks = [_rank_fen(board, rank) for rank in range(8)]
+        self._move = move
+        if board.turn == self._color:
+            self._fen_before = sys.intern(self._key(self._ranks, board))
+            self._san_move = board.san(move)
+        else:
+            self._fen_before = None
+
+    def visit_board(self, board: chess.Board) -> None:
+        move, ranks = self._move, self._ranks
+        if move is None or ranks is None:
+            return
+        self._move = None
+        for rank in {chess.square_rank(move.from_square), chess.square_rank(move.to_square)}:
+            ranks[rank] = _rank_fen(board, rank)
+        if self._fen_before is not None:
+            self._tree.setdefault(self._fen_before, {})[self._san_move] = sys.intern(self._key(ranks, board))
+
+    def handle_error(self, error: Exception) -> None:
+        # Like GameBuilder, log and keep reading the following games
+        LOGGER.error("%s while importing PGN", error)
+        self._abandoned = True
+        self._move = None
+
+    def result(self) -> bool:
+        return True
+
 
 class RepertoireManager:
     """Load, update and query a repertoire stored as a FEN tree."""
@@ -20,6 +172,13 @@ class RepertoireManager:
         self.black_path = black_path
         self._white_tree: RepertoireTree = {}
         self._black_tree: RepertoireTree = {}
+        # Bumped on every mutation so callers can cache views derived from the trees
+        self._version = 0
+        self._dirty = False
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     @property
     def white_tree(self) -> RepertoireTree:
@@ -30,28 +189,22 @@ class RepertoireManager:
         return self._black_tree
 
     def load(self) -> None:
-        raw_white = load_json(self.white_path)
-        raw_black = load_json(self.black_path)
-        if isinstance(raw_white, dict):
-            self._white_tree = {
-                fen: {move: next_fen for move, next_fen in moves.items() if isinstance(move, str) and isinstance(next_fen, str)}
-                for fen, moves in raw_white.items()
-                if isinstance(fen, str) and isinstance(moves, dict)
-            }
-        else:
-            self._white_tree = {}
-        if isinstance(raw_black, dict):
-            self._black_tree = {
-                fen: {move: next_fen for move, next_fen in moves.items() if isinstance(move, str) and isinstance(next_fen, str)}
-                for fen, moves in raw_black.items()
-                if isinstance(fen, str) and isinstance(moves, dict)
-            }
-        else:
-            self._black_tree = {}
+        self._white_tree, white_migrated = _read_tree(self.white_path)
+        self._black_tree, black_migrated = _read_tree(self.black_path)
+        self._version += 1
+        # Write migrated files back tagged so the next load can trust them
+        self._dirty = white_migrated or black_migrated
 
     def save(self) -> None:
-        save_json(self.white_path, self._white_tree)
-        save_json(self.black_path, self._black_tree)
+        if not self._dirty:
+            return
+        _write_tree(self.white_path, self._white_tree)
+        _write_tree(self.black_path, self._black_tree)
+        self._dirty = False
+
+    def _mark_changed(self) -> None:
+        self._version += 1
+        self._dirty = True
 
     # repertoire operations
     def get_next_position(self, fen: str, move: str, side: str) -> Optional[str]:
@@ -64,13 +217,14 @@ class RepertoireManager:
 
     def add_line(self, board: chess.Board, moves: Iterable[chess.Move], side: str) -> None:
         tree = self._white_tree if side == "white" else self._black_tree
+        self._mark_changed()
         for move in moves:
             # Only save moves for the relevant side
             if (side == "white" and board.turn) or (side == "black" and not board.turn):
-                fen_before = board.fen()
+                fen_before = sys.intern(board.epd())
                 san_move = board.san(move)
                 board.push(move)
-                fen_after = board.fen()
+                fen_after = sys.intern(board.epd())
                 tree.setdefault(fen_before, {})[san_move] = fen_after
             else:
                 board.push(move)
@@ -80,10 +234,10 @@ class RepertoireManager:
             # Add moves for the relevant side at this node
             if node.move is not None:
                 if (side == "white" and board.turn) or (side == "black" and not board.turn):
-                    fen_before = board.fen()
+                    fen_before = sys.intern(board.epd())
                     san_move = board.san(node.move)
                     board.push(node.move)
-                    fen_after = board.fen()
+                    fen_after = sys.intern(board.epd())
                     tree = self._white_tree if side == "white" else self._black_tree
                     tree.setdefault(fen_before, {})[san_move] = fen_after
                 else:
@@ -92,34 +246,55 @@ class RepertoireManager:
             for variation in node.variations:
                 add_variation(board.copy(), variation)
 
+        self._mark_changed()
         add_variation(game.board(), game)
 
-    def import_pgn_white(self, source: Path) -> int:
-        """Import a PGN file and merge it into the white repertoire."""
+    def _import_from_pgn(
+        self,
+        source: Union[Path, TextIO],
+        side: str,
+        header_filter: Optional[Callable[[chess.pgn.Headers], bool]] = None,
+    ) -> int:
+        """Merge every game from ``source`` into the ``side`` repertoire.
+
+        ``source`` is a path or an open text handle. When ``header_filter`` is
+        given, only headers are parsed up front (e.g. to select by ECO or
+        Opening tags) and movetext is read only for games that pass; this
+        requires a seekable handle.
+        """
+        if isinstance(source, Path):
+            with source.open("r", encoding="utf-8") as fh:
+                return self._import_from_pgn(fh, side, header_filter)
+        tree = self._white_tree if side == "white" else self._black_tree
+        color = chess.WHITE if side == "white" else chess.BLACK
+        self._mark_changed()
         count = 0
-        with source.open("r", encoding="utf-8") as fh:
-            while True:
-                game = chess.pgn.read_game(fh)
-                if game is None:
+        while True:
+            if header_filter is not None:
+                offset = source.tell()
+                headers = chess.pgn.read_headers(source)
+                if headers is None:
                     break
-                self.add_game(game, side="white")
-                count += 1
+                if not header_filter(headers):
+                    continue
+                source.seek(offset)
+            found = chess.pgn.read_game(source, Visitor=lambda: _RepertoireVisitor(tree, color))
+            if found is None:
+                break
+            count += 1
         return count
 
-    def import_pgn_black(self, source: Path) -> int:
+    def import_pgn_white(self, source: Path, header_filter: Optional[Callable[[chess.pgn.Headers], bool]] = None) -> int:
+        """Import a PGN file and merge it into the white repertoire."""
+        return self._import_from_pgn(source, "white", header_filter)
+
+    def import_pgn_black(self, source: Path, header_filter: Optional[Callable[[chess.pgn.Headers], bool]] = None) -> int:
         """Import a PGN file and merge it into the black repertoire."""
-        count = 0
-        with source.open("r", encoding="utf-8") as fh:
-            while True:
-                game = chess.pgn.read_game(fh)
-                if game is None:
-                    break
-                self.add_game(game, side="black")
-                count += 1
-        return count
+        return self._import_from_pgn(source, "black", header_filter)
 
     def to_dict(self, side: str) -> RepertoireTree:
         return self._white_tree if side == "white" else self._black_tree
 
     def replace(self, data: RepertoireTree) -> None:
         self._tree = data
+        self._mark_changed()
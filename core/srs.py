@@ -1,13 +1,17 @@
 """Spaced repetition scheduler based on the SM-2 algorithm."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from pathlib import Path
-from statistics import fmean
-from typing import Dict, Iterable, Optional, Sequence
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Iterable, Mapping, Optional, Set, Tuple
+
+import numpy as np
 
 from .persistence import load_json, save_json
+from .repertoire import position_key
 
 ISO_FORMAT = "%Y-%m-%d"
 DEFAULT_EASE = 2.5
@@ -22,16 +26,25 @@ def _format_date(value: date) -> str:
     return value.strftime(ISO_FORMAT)
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     fen: str
     ease: float = DEFAULT_EASE
     interval: int = 0
     repetitions: int = 0
-    due: date = field(default_factory=date.today)
+    # Stored as a proleptic ordinal so due-date comparisons are plain int compares
+    due_ordinal: int = field(default_factory=lambda: date.today().toordinal())
     last_grade: Optional[int] = None
     last_reviewed: Optional[date] = None
 
+    @property
+    def due(self) -> date:
+        return date.fromordinal(self.due_ordinal)
+
+    @due.setter
+    def due(self, value: date) -> None:
+        self.due_ordinal = value.toordinal()
+
     def to_dict(self) -> Dict[str, object]:
         return {
             "ease": self.ease,
@@ -63,7 +76,7 @@ class Card:
             ease=float(data.get("ease", DEFAULT_EASE)),
             interval=int(data.get("interval", 0)),
             repetitions=int(data.get("repetitions", 0)),
-            due=due,
+            due_ordinal=due.toordinal(),
             last_grade=int(data["last_grade"]) if isinstance(data.get("last_grade"), int) else None,
             last_reviewed=last_reviewed,
         )
@@ -75,37 +88,66 @@ class SRSManager:
     def __init__(self, path: Path) -> None:
         self.path = path
         self._cards: Dict[str, Card] = {}
+        # Serialised cards as last written, and the fens whose entry is stale
+        self._payload: Dict[str, Dict[str, object]] = {}
+        self._dirty: Set[str] = set()
+        # Column arrays (due ordinal, ease, last grade or -1) for statistics(), one row per card.
+        # Rebuilt lazily after cards are added or removed, updated in place by schedule().
+        self._columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._row: Dict[str, int] = {}
 
     def load(self) -> None:
         raw = load_json(self.path)
+        self._payload = {}
+        self._columns = None
         if not isinstance(raw, dict):
             self._cards = {}
+            self._dirty = set()
             return
         cards: Dict[str, Card] = {}
         for fen, data in raw.items():
             if isinstance(fen, str) and isinstance(data, dict):
-                cards[fen] = Card.from_dict(fen, data)
+                # Older state files were keyed by full FEN; fold them onto EPD keys
+                key = sys.intern(position_key(fen))
+                card = Card.from_dict(key, data)
+                existing = cards.get(key)
+                if existing is None or card.due_ordinal < existing.due_ordinal:
+                    cards[key] = card
         self._cards = cards
+        self._dirty = set(cards)
 
     def save(self) -> None:
-        payload = {fen: card.to_dict() for fen, card in self._cards.items()}
-        save_json(self.path, payload)
+        if not self._dirty:
+            return
+        # Only re-serialise cards that changed since the previous save
+        for fen in self._dirty:
+            card = self._cards.get(fen)
+            if card is None:
+                self._payload.pop(fen, None)
+            else:
+                self._payload[fen] = card.to_dict()
+        self._dirty.clear()
+        save_json(self.path, self._payload)
 
     def get(self, fen: str) -> Card:
         if fen not in self._cards:
             # New card: set due date to today
-            self._cards[fen] = Card(fen=fen, due=date.today())
+            fen = sys.intern(fen)
+            self._cards[fen] = Card(fen=fen, due_ordinal=date.today().toordinal())
+            self._dirty.add(fen)
+            self._columns = None
         return self._cards[fen]
 
     def schedule(self, fen: str, grade: int, today: Optional[date] = None) -> Card:
         today = today or date.today()
+        today_ord = today.toordinal()
         card = self.get(fen)
         card.last_grade = grade
         card.last_reviewed = today
         if grade < 3:
             card.repetitions = 0
             card.interval = 1
-            card.due = today  # Repeat missed move today
+            card.due_ordinal = today_ord  # Repeat missed move today
         else:
             if card.repetitions == 0:
                 card.interval = 1
@@ -115,26 +157,61 @@ class SRSManager:
                 card.interval = int(round(card.interval * card.ease)) or 1
             card.repetitions += 1
             card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - grade) * 0.08)
-            card.due = today + timedelta(days=card.interval)
-        self._cards[fen] = card
+            card.due_ordinal = today_ord + card.interval
+        self._dirty.add(fen)
+        if self._columns is not None:
+            due_ord, ease, last_grade = self._columns
+            row = self._row[fen]
+            due_ord[row] = card.due_ordinal
+            ease[row] = card.ease
+            last_grade[row] = grade
         return card
 
     def due_cards(self, today: Optional[date] = None) -> Iterable[Card]:
-        today = today or date.today()
-        return sorted((card for card in self._cards.values() if card.due <= today), key=lambda c: (c.due, c.ease))
+        today_ord = (today or date.today()).toordinal()
+        return sorted(
+            (card for card in self._cards.values() if card.due_ordinal <= today_ord),
+            key=lambda c: (c.due_ordinal, c.ease),
+        )
+
+    def next_due(self, today: Optional[date] = None, fens: Optional[AbstractSet[str]] = None) -> Optional[Card]:
+        """Return the first card :meth:`due_cards` would yield, optionally limited to ``fens``.
+
+        A single ``min`` pass avoids sorting the whole due queue.
+        """
+        today_ord = (today or date.today()).toordinal()
+        cards = self._cards.values()
+        if fens is not None:
+            due = (card for card in cards if card.due_ordinal <= today_ord and card.fen in fens)
+        else:
+            due = (card for card in cards if card.due_ordinal <= today_ord)
+        return min(due, key=lambda c: (c.due_ordinal, c.ease), default=None)
 
-    def next_due(self, today: Optional[date] = None) -> Optional[Card]:
-        cards = list(self.due_cards(today=today))
-        return cards[0] if cards else None
+    def all_cards(self) -> Mapping[str, Card]:
+        """Return a read-only view of the cards keyed by FEN, without copying them."""
+        return MappingProxyType(self._cards)
 
-    def all_cards(self) -> Dict[str, Card]:
-        return dict(self._cards)
+    def remove_cards(self, fens_to_keep: AbstractSet[str]) -> None:
+        kept = {fen: card for fen, card in self._cards.items() if fen in fens_to_keep}
+        if len(kept) == len(self._cards):
+            return
+        self._dirty.update(fen for fen in self._cards if fen not in kept)
+        self._cards = kept
+        self._columns = None
 
-    def remove_cards(self, fens_to_keep: Sequence[str]) -> None:
-        allowed = set(fens_to_keep)
-        to_remove = [fen for fen in self._cards if fen not in allowed]
-        for fen in to_remove:
-            self._cards.pop(fen, None)
+    def _stat_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._columns is None:
+            cards = self._cards.values()
+            count = len(cards)
+            self._row = {fen: row for row, fen in enumerate(self._cards)}
+            self._columns = (
+                np.fromiter((card.due_ordinal for card in cards), dtype=np.int32, count=count),
+                np.fromiter((card.ease for card in cards), dtype=np.float64, count=count),
+                np.fromiter(
+                    (-1 if card.last_grade is None else card.last_grade for card in cards), dtype=np.int8, count=count
+                ),
+            )
+        return self._columns
 
     @dataclass
     class Stats:
@@ -148,9 +225,8 @@ class SRSManager:
 
     def statistics(self, today: Optional[date] = None, horizon_days: int = 7) -> "SRSManager.Stats":
         today = today or date.today()
-        cards = list(self._cards.values())
-        total_cards = len(cards)
-        if not cards:
+        total_cards = len(self._cards)
+        if not total_cards:
             return self.Stats(
                 total_cards=0,
                 due_today=0,
@@ -161,16 +237,17 @@ class SRSManager:
                 last_session_success_rate=0.0,
             )
 
-        due_today = sum(1 for card in cards if card.due <= today)
-        overdue = sum(1 for card in cards if card.due < today)
-        horizon_limit = today + timedelta(days=horizon_days)
-        due_within_horizon = sum(1 for card in cards if today <= card.due <= horizon_limit)
-        average_ease = fmean(card.ease for card in cards)
+        due_ord, ease, last_grade = self._stat_columns()
+        today_ord = today.toordinal()
+        due_today = int(np.count_nonzero(due_ord <= today_ord))
+        overdue = int(np.count_nonzero(due_ord < today_ord))
+        due_within_horizon = int(np.count_nonzero((due_ord >= today_ord) & (due_ord <= today_ord + horizon_days)))
+        average_ease = float(ease.mean())
 
-        graded_cards = [card for card in cards if card.last_grade is not None]
-        if graded_cards:
-            success = sum(1 for card in graded_cards if card.last_grade and card.last_grade >= 3)
-            last_session_success_rate = success / len(graded_cards)
+        graded = int(np.count_nonzero(last_grade >= 0))
+        if graded:
+            success = int(np.count_nonzero(last_grade >= 3))
+            last_session_success_rate = success / graded
         else:
             last_session_success_rate = 0.0
 
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
 
 import chess
 
@@ -11,6 +12,37 @@ from .repertoire import RepertoireManager
 from .srs import Card, SRSManager
 
 
+@lru_cache(maxsize=512)
+def _board_for(fen: str) -> chess.Board:
+    """Return a shared board for ``fen``; callers must leave it unchanged."""
+    return chess.Board(fen)
+
+
+@lru_cache(maxsize=2048)
+def _normalize_move(fen: str, move_text: str) -> Optional[str]:
+    """Return ``move_text`` (SAN or UCI) as SAN if it is legal in ``fen``, else ``None``.
+
+    Results are cached because the same position is typically retried several
+    times in a session.
+    """
+    board = _board_for(fen)
+    text = move_text.strip()
+    if not text:
+        return None
+    try:
+        move = board.parse_san(text)
+        return board.san(move)
+    except ValueError:
+        pass
+    try:
+        move = chess.Move.from_uci(text.lower())
+    except ValueError:
+        return None
+    if move not in board.legal_moves:
+        return None
+    return board.san(move)
+
+
 @dataclass
 class TrainingResult:
     fen: str
@@ -27,46 +59,41 @@ class Trainer:
     def __init__(self, repertoire: RepertoireManager, srs: SRSManager) -> None:
         self.repertoire = repertoire
         self.srs = srs
+        # Per-side position sets, rebuilt only when the repertoire version changes
+        self._allowed_white: Optional[FrozenSet[str]] = None
+        self._allowed_black: Optional[FrozenSet[str]] = None
+        self._allowed_version = -1
+
+    def _allowed_fens(self, side: str) -> FrozenSet[str]:
+        if self._allowed_version != self.repertoire.version:
+            self._allowed_white = None
+            self._allowed_black = None
+            self._allowed_version = self.repertoire.version
+        if side == "white":
+            if self._allowed_white is None:
+                self._allowed_white = frozenset(self.repertoire.white_tree)
+            return self._allowed_white
+        if self._allowed_black is None:
+            self._allowed_black = frozenset(self.repertoire.black_tree)
+        return self._allowed_black
 
     def sync_with_repertoire(self) -> None:
-        white_fens = list(self.repertoire.white_tree.keys())
-        black_fens = list(self.repertoire.black_tree.keys())
-        all_fens = white_fens + black_fens
-        for fen in all_fens:
-            self.srs.get(fen)
-        self.srs.remove_cards(all_fens)
+        # Walk the trees rather than the sets so new cards keep the repertoire's order,
+        # which decides ties between cards that are due on the same day
+        for tree in (self.repertoire.white_tree, self.repertoire.black_tree):
+            for fen in tree:
+                self.srs.get(fen)
+        self.srs.remove_cards(self._allowed_fens("white") | self._allowed_fens("black"))
 
     def next_card(self, side: str, today: Optional[date] = None) -> Optional[Card]:
         # Only show cards for the selected side
-        if side == "white":
-            allowed_fens = set(self.repertoire.white_tree.keys())
-        else:
-            allowed_fens = set(self.repertoire.black_tree.keys())
-        cards = [card for card in self.srs.due_cards(today=today) if card.fen in allowed_fens]
-        return cards[0] if cards else None
+        allowed_fens = self._allowed_fens(side)
+        return self.srs.next_due(today=today, fens=allowed_fens)
 
     def available_moves(self, fen: str, side: str) -> Dict[str, str]:
         moves = self.repertoire.get_available_moves(fen, side)
         return dict(sorted(moves.items()))
 
-    def _normalize_move(self, fen: str, move_text: str) -> Optional[str]:
-        board = chess.Board(fen)
-        text = move_text.strip()
-        if not text:
-            return None
-        try:
-            move = board.parse_san(text)
-            return board.san(move)
-        except ValueError:
-            pass
-        try:
-            move = chess.Move.from_uci(text.lower())
-        except ValueError:
-            return None
-        if move not in board.legal_moves:
-            return None
-        return board.san(move)
-
     def grade_answer(self, fen: str, move_text: str, side: str, success_grade: int = 5, failure_grade: int = 1) -> TrainingResult:
         available = self.available_moves(fen, side)
         if not available:
@@ -79,7 +106,7 @@ class Trainer:
                 message="No moves stored for this position.",
             )
 
-        normalized = self._normalize_move(fen, move_text)
+        normalized = _normalize_move(fen, move_text)
         if normalized is None:
             # Illegal move: prompt user to try again, don't mark as incorrect or advance
             return TrainingResult(
@@ -1,7 +1,8 @@
 """Simple chess board widget using a QTableWidget grid with rank/file labels."""
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
 
 import chess
 from PyQt5.QtCore import Qt
@@ -13,13 +14,19 @@ from PyQt5.QtWidgets import (
     QGridLayout,
 )
 
-PIECE_SYMBOLS = {
-    chess.PAWN: {True: "♙", False: "♟"},
-    chess.KNIGHT: {True: "♘", False: "♞"},
-    chess.BISHOP: {True: "♗", False: "♝"},
-    chess.ROOK: {True: "♖", False: "♜"},
-    chess.QUEEN: {True: "♕", False: "♛"},
-    chess.KING: {True: "♔", False: "♚"},
+PIECE_GLYPHS = {
+    "P": "♙",
+    "N": "♘",
+    "B": "♗",
+    "R": "♖",
+    "Q": "♕",
+    "K": "♔",
+    "p": "♟",
+    "n": "♞",
+    "b": "♝",
+    "r": "♜",
+    "q": "♛",
+    "k": "♚",
 }
 
 LIGHT_COLOR = QColor(240, 217, 181)
@@ -33,6 +40,42 @@ def _rgb(qc: QColor) -> str:
     return f"{qc.red()},{qc.green()},{qc.blue()}"
 
 
+# Stylesheet fragments never change, so build them once instead of per cell and refresh
+LIGHT_STYLE = f"background-color: rgb({_rgb(LIGHT_COLOR)});"
+DARK_STYLE = f"background-color: rgb({_rgb(DARK_COLOR)});"
+HIGHLIGHT_STYLE = f"background-color: rgb({_rgb(HIGHLIGHT_COLOR)});"
+# Readable coordinate colors: light tile -> dark text, dark tile -> light text
+LIGHT_LABEL_COLOR = "0,0,0"
+DARK_LABEL_COLOR = "255,255,255"
+
+# Indexed by [is_light_tile][is_highlighted]
+TILE_STYLES = ((DARK_STYLE, HIGHLIGHT_STYLE), (LIGHT_STYLE, HIGHLIGHT_STYLE))
+# Whether each table cell (row * 8 + col) is a light tile
+LIGHT_CELLS = tuple((row + col) % 2 == 0 for row in range(8) for col in range(8))
+
+
+@lru_cache(maxsize=256)
+def _decode_placement(fen: str) -> Tuple[str, ...]:
+    """Return the piece glyph on each square (a1..h8) of ``fen``, ``""`` for empty squares.
+
+    Only the piece placement field is read, which is all the widget needs for
+    display and avoids setting up a full :class:`chess.Board`. Results are
+    cached since the same positions (e.g. the starting board) come back often.
+    """
+    placement = fen.split(" ", 1)[0]
+    grid = [""] * 64
+    square = 56  # FEN lists rank 8 first, starting from a8
+    for ch in placement:
+        if ch == "/":
+            square -= 16
+        elif ch.isdigit():
+            square += int(ch)
+        else:
+            grid[square] = PIECE_GLYPHS[ch]
+            square += 1
+    return tuple(grid)
+
+
 class BoardWidget(QTableWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(8, 8, parent)
@@ -47,8 +90,58 @@ class BoardWidget(QTableWidget):
         self._current_fen: Optional[str] = None
         self._last_highlight: Optional[Iterable[int]] = None
         self._flipped: bool = False
+        # Cell widgets are built once; refresh() only mutates their text and colors
+        self._cells: List[List[Tuple[QWidget, QLabel, QLabel, QLabel]]] = [
+            [self._build_cell(row, col) for col in range(8)] for row in range(8)
+        ]
+        self._last_bg: List[List[Optional[str]]] = [[None] * 8 for _ in range(8)]
+        # What is currently drawn, so refresh() can update only the squares that changed
+        self._prev_grid: Tuple[str, ...] = ("",) * 64
+        self._prev_highlight: Set[int] = set()
+        self._drawn_flipped: Optional[bool] = None
         self.refresh(chess.STARTING_BOARD_FEN)
 
+    def _build_cell(self, row: int, col: int) -> Tuple[QWidget, QLabel, QLabel, QLabel]:
+        label_color = LIGHT_LABEL_COLOR if LIGHT_CELLS[row * 8 + col] else DARK_LABEL_COLOR
+
+        # Create cell container widget
+        cell = QWidget()
+        layout = QGridLayout(cell)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(0)
+
+        # Piece label (center)
+        piece_label = QLabel()
+        piece_label.setAttribute(Qt.WA_TranslucentBackground)
+        piece_label.setAlignment(Qt.AlignCenter)
+        piece_label.setFont(FONT)
+        # Use the same text color for pieces (unicode glyphs differ between white/black pieces)
+        piece_label.setStyleSheet("background: transparent;")
+
+        # File label (bottom-left) — only filled on bottom table row
+        file_label = QLabel()
+        file_label.setFont(LABEL_FONT)
+        file_label.setAttribute(Qt.WA_TranslucentBackground)
+        file_label.setStyleSheet(f"background: transparent; color: rgb({label_color});")
+        file_label.setAlignment(Qt.AlignLeft | Qt.AlignBottom)
+
+        # Rank label (top-right) — only filled on rightmost table column
+        rank_label = QLabel()
+        rank_label.setFont(LABEL_FONT)
+        rank_label.setAttribute(Qt.WA_TranslucentBackground)
+        rank_label.setStyleSheet(f"background: transparent; color: rgb({label_color});")
+        rank_label.setAlignment(Qt.AlignRight | Qt.AlignTop)
+
+        # Add widgets to the same grid cell and align them accordingly (they will overlap)
+        # We put them in a single 1x1 cell and rely on alignment flags
+        layout.addWidget(piece_label, 0, 0, Qt.AlignCenter)
+        layout.addWidget(file_label, 0, 0, Qt.AlignLeft | Qt.AlignBottom)
+        layout.addWidget(rank_label, 0, 0, Qt.AlignRight | Qt.AlignTop)
+
+        # Finally place the composed widget into the table
+        self.setCellWidget(row, col, cell)
+        return cell, piece_label, file_label, rank_label
+
     def set_flipped(self, flipped: bool) -> None:
         self._flipped = flipped
         # Refresh board with current FEN to apply orientation
@@ -56,85 +149,56 @@ class BoardWidget(QTableWidget):
             self.refresh(self._current_fen)
 
     def refresh(self, fen: str, highlight: Optional[Iterable[chess.Square]] = None) -> None:
-        board = chess.Board(fen)
+        grid = _decode_placement(fen)
         self._current_fen = fen
         highlight = set(highlight or [])
 
-        # Iterate table cells (row 0..7 top->bottom, col 0..7 left->right)
+        if self._drawn_flipped != self._flipped:
+            # First draw or orientation change: every cell now shows a different square
+            self._drawn_flipped = self._flipped
+            self._update_coordinates()
+            squares: Iterable[int] = range(64)
+        else:
+            # Consecutive positions usually differ by a few squares; only touch those
+            prev_grid, prev_highlight = self._prev_grid, self._prev_highlight
+            squares = [
+                square
+                for square in range(64)
+                if grid[square] != prev_grid[square] or (square in highlight) != (square in prev_highlight)
+            ]
+        for square in squares:
+            self._update_cell(square, grid[square], square in highlight)
+        self._prev_grid = grid
+        self._prev_highlight = highlight
+
+    def _update_coordinates(self) -> None:
+        # File letters along the bottom table row, rank numbers down the rightmost column
+        for col in range(8):
+            display_col = 7 - col if self._flipped else col
+            self._cells[7][col][2].setText(chr(ord("a") + display_col))
         for row in range(8):
-            for col in range(8):
-                # Determine which square this cell represents depending on orientation
-                if not self._flipped:
-                    display_row = 7 - row  # table row 0 -> rank 8, row 7 -> rank 1
-                    display_col = col
-                else:
-                    display_row = row  # table row 0 -> rank 1 (flipped)
-                    display_col = 7 - col
-
-                square = chess.square(display_col, display_row)
-                piece = board.piece_at(square)
-
-                # Choose tile background color
-                base_color = LIGHT_COLOR if (row + col) % 2 == 0 else DARK_COLOR
-                tile_color = HIGHLIGHT_COLOR if square in highlight else base_color
-                bg_rgb = _rgb(tile_color)
-
-                # Compute file letter and rank number for the given square (based on display coords)
-                file_letter = chr(ord("a") + display_col)
-                rank_number = str(display_row + 1)
-
-                # Create cell container widget
-                cell = QWidget()
-                layout = QGridLayout(cell)
-                layout.setContentsMargins(2, 2, 2, 2)
-                layout.setSpacing(0)
-
-                # Piece label (center)
-                piece_label = QLabel()
-                piece_label.setAttribute(Qt.WA_TranslucentBackground)
-                piece_label.setAlignment(Qt.AlignCenter)
-                piece_label.setFont(FONT)
-                piece_label.setText(PIECE_SYMBOLS[piece.piece_type][piece.color] if piece else "")
-                # Use the same text color for pieces (unicode glyphs differ between white/black pieces)
-                piece_label.setStyleSheet("background: transparent;")
-
-                # File label (bottom-left) — only on bottom table row
-                file_label = QLabel()
-                file_label.setFont(LABEL_FONT)
-                file_label.setAttribute(Qt.WA_TranslucentBackground)
-                file_label.setStyleSheet("background: transparent;")
-                file_label.setText(file_letter if row == 7 else "")
-                file_label.setAlignment(Qt.AlignLeft | Qt.AlignBottom)
-
-                # Rank label (top-right) — only on rightmost table column
-                rank_label = QLabel()
-                rank_label.setFont(LABEL_FONT)
-                rank_label.setAttribute(Qt.WA_TranslucentBackground)
-                rank_label.setStyleSheet("background: transparent;")
-                rank_label.setText(rank_number if col == 7 else "")
-                rank_label.setAlignment(Qt.AlignRight | Qt.AlignTop)
-
-                # Choose a readable label color depending on tile brightness
-                # Simple brightness heuristic: light tile -> dark text, dark tile -> light text
-                if (base_color.red() * 0.299 + base_color.green() * 0.587 + base_color.blue() * 0.114) > 186:
-                    label_color = "0,0,0"
-                else:
-                    label_color = "255,255,255"
-
-                file_label.setStyleSheet(f"background: transparent; color: rgb({label_color});")
-                rank_label.setStyleSheet(f"background: transparent; color: rgb({label_color});")
-
-                # Set the background color on the container so transparent labels reveal it
-                cell.setStyleSheet(f"background-color: rgb({bg_rgb});")
-
-                # Add widgets to the same grid cell and align them accordingly (they will overlap)
-                # We put them in a single 1x1 cell and rely on alignment flags
-                layout.addWidget(piece_label, 0, 0, Qt.AlignCenter)
-                layout.addWidget(file_label, 0, 0, Qt.AlignLeft | Qt.AlignBottom)
-                layout.addWidget(rank_label, 0, 0, Qt.AlignRight | Qt.AlignTop)
-
-                # Finally place the composed widget into the table
-                self.setCellWidget(row, col, cell)
+            display_row = row if self._flipped else 7 - row
+            self._cells[row][7][3].setText(str(display_row + 1))
+
+    def _update_cell(self, square: chess.Square, glyph: str, highlighted: bool) -> None:
+        # Determine which table cell shows this square depending on orientation
+        if not self._flipped:
+            row = 7 - chess.square_rank(square)  # rank 8 -> table row 0
+            col = chess.square_file(square)
+        else:
+            row = chess.square_rank(square)  # rank 1 -> table row 0 (flipped)
+            col = 7 - chess.square_file(square)
+
+        # Choose tile background style
+        bg_style = TILE_STYLES[LIGHT_CELLS[row * 8 + col]][highlighted]
+
+        cell, piece_label, _, _ = self._cells[row][col]
+        piece_label.setText(glyph)
+        # Restyling makes Qt reparse the stylesheet, so only do it when the tile color changed
+        if self._last_bg[row][col] != bg_style:
+            # Set the background color on the container so transparent labels reveal it
+            cell.setStyleSheet(bg_style)
+            self._last_bg[row][col] = bg_style
 
     def current_fen(self) -> Optional[str]:
         return self._current_fen
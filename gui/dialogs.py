@@ -1,15 +1,82 @@
 """Auxiliary dialogs for the Chess Opening Trainer GUI."""
 from __future__ import annotations
 
-from typing import Iterable
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Sequence, Tuple
 
-from PyQt5.QtWidgets import QLabel, QDialog, QTableWidget, QTableWidgetItem, QVBoxLayout
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QHeaderView, QLabel, QDialog, QTableView, QVBoxLayout
 
 from core.srs import Card, SRSManager
 
+# Fixed widths for the card table columns (FEN, Due, Interval, Ease, Last Grade).
+# Sizing to contents would format every cell just to measure it.
+COLUMN_WIDTHS = (380, 100, 70, 60, 80)
+
+
+@lru_cache(maxsize=1024)
+def _due_text(due_ordinal: int) -> str:
+    # Reviews bunch up on the same days, so most cards share a handful of due dates
+    return date.fromordinal(due_ordinal).isoformat()
+
+
+# Rows handed to the view per batch; more are fetched as the user scrolls
+FETCH_BATCH_SIZE = 256
+
+# Cell text for each column, indexed by column number
+COLUMN_TEXT: Tuple[Callable[[Card], str], ...] = (
+    attrgetter("fen"),
+    lambda card: _due_text(card.due_ordinal),
+    lambda card: str(card.interval),
+    lambda card: f"{card.ease:.2f}",
+    lambda card: "" if card.last_grade is None else str(card.last_grade),
+)
+
+
+class CardTableModel(QAbstractTableModel):
+    """Read-only table of SRS cards; cell strings are built only when Qt asks for them."""
+
+    HEADERS = ("FEN", "Due", "Interval", "Ease", "Last Grade")
+
+    def __init__(self, cards: Sequence[Card], parent=None) -> None:
+        super().__init__(parent)
+        self._cards = cards
+        self._loaded = min(len(cards), FETCH_BATCH_SIZE)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 - PyQt API
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: N802 - PyQt API
+        return not parent.isValid() and self._loaded < len(self._cards)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # noqa: N802 - PyQt API
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH_SIZE, len(self._cards) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 - PyQt API
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return COLUMN_TEXT[index.column()](self._cards[index.row()])
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # noqa: N802 - PyQt API
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
 
 class StatsDialog(QDialog):
-    def __init__(self, cards: Iterable[Card], stats: SRSManager.Stats, parent=None) -> None:
+    def __init__(self, cards: Sequence[Card], stats: SRSManager.Stats, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Training Statistics")
         layout = QVBoxLayout(self)
@@ -27,17 +94,20 @@ class StatsDialog(QDialog):
         summary.setWordWrap(True)
         layout.addWidget(summary)
 
-        table = QTableWidget(self)
-        table.setColumnCount(5)
-        table.setHorizontalHeaderLabels(["FEN", "Due", "Interval", "Ease", "Last Grade"])
-        card_list = list(cards)
-        table.setRowCount(len(card_list))
-        for row, card in enumerate(card_list):
-            table.setItem(row, 0, QTableWidgetItem(card.fen))
-            table.setItem(row, 1, QTableWidgetItem(card.due.isoformat()))
-            table.setItem(row, 2, QTableWidgetItem(str(card.interval)))
-            table.setItem(row, 3, QTableWidgetItem(f"{card.ease:.2f}"))
-            last_grade = "" if card.last_grade is None else str(card.last_grade)
-            table.setItem(row, 4, QTableWidgetItem(last_grade))
-        table.resizeColumnsToContents()
+        # A model/view table only formats the rows that are actually painted
+        self.model = CardTableModel(cards, self)
+        table = QTableView(self)
+        # Configure the view in one batch instead of relaying out after every call
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        table.setModel(self.model)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for column, width in enumerate(COLUMN_WIDTHS):
+            table.setColumnWidth(column, width)
+        # Uniform row heights spare the vertical header from measuring each row
+        rows = table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(table.fontMetrics().height() + 8)
+        table.setUpdatesEnabled(True)
         layout.addWidget(table)
@@ -1,15 +1,16 @@
 """Main window for the Chess Opening Trainer application."""
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Optional
 
 import chess
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
 from PyQt5.QtWidgets import (
     QAction,
     QFileDialog,
+    QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QMainWindow,
@@ -20,12 +21,35 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from core.persistence import save_json
 from core.repertoire import RepertoireManager
 from core.trainer import Trainer
 from core.srs import Card, SRSManager
 from .board_widget import BoardWidget
 from .dialogs import StatsDialog
 
+# Delay before SRS state is written, so a burst of reviews results in one save
+SAVE_DELAY_MS = 2000
+
+
+class _SyncSignals(QObject):
+    finished = pyqtSignal()
+
+
+class SyncTask(QRunnable):
+    """Run :meth:`Trainer.sync_with_repertoire` on a thread pool worker."""
+
+    def __init__(self, trainer: Trainer) -> None:
+        super().__init__()
+        self.trainer = trainer
+        self.signals = _SyncSignals()
+
+    def run(self) -> None:
+        try:
+            self.trainer.sync_with_repertoire()
+        finally:
+            self.signals.finished.emit()
+
 
 class MainWindow(QMainWindow):
     def __init__(self, srs: SRSManager, trainer: Trainer, data_dir: Path) -> None:
@@ -48,7 +72,15 @@ class MainWindow(QMainWindow):
         self._create_menus()
         self._create_toolbar()
         self.statusBar().showMessage("Ready")
-        self._latest_stats = self.srs.statistics()
+        # Statistics scan every card, so they are recomputed only after SRS state changed
+        self._latest_stats: Optional[SRSManager.Stats] = None
+        self._stats_dirty = True
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.srs.save)
+        self._sync_task: Optional[SyncTask] = None
+        self._status_before_sync = ""
         self.refresh_state()
 
     def _build_ui(self) -> None:
@@ -82,23 +114,30 @@ class MainWindow(QMainWindow):
 
         self.check_button = QPushButton("Check Move", self)
         self.check_button.clicked.connect(self.on_check_move)
-        layout.addWidget(self.check_button)
 
         self.forgot_button = QPushButton("I Forgot", self)
         self.forgot_button.clicked.connect(self.on_mark_incorrect)
-        layout.addWidget(self.forgot_button)
 
         self.correct_button = QPushButton("Mark Correct", self)
         self.correct_button.clicked.connect(self.on_mark_correct)
-        layout.addWidget(self.correct_button)
 
         self.skip_button = QPushButton("Skip", self)
         self.skip_button.clicked.connect(self.load_next_card)
-        layout.addWidget(self.skip_button)
 
         self.switch_side_button = QPushButton("Switch Training Side", self)
         self.switch_side_button.clicked.connect(self.set_training_side)
-        layout.addWidget(self.switch_side_button)
+
+        # Action buttons share a single row
+        button_row = QHBoxLayout()
+        for button in (
+            self.check_button,
+            self.forgot_button,
+            self.correct_button,
+            self.skip_button,
+            self.switch_side_button,
+        ):
+            button_row.addWidget(button)
+        layout.addLayout(button_row)
 
         self.setCentralWidget(central)
 
@@ -133,10 +172,31 @@ class MainWindow(QMainWindow):
         self.addToolBar(toolbar)
 
     def refresh_state(self) -> None:
-        self.trainer.sync_with_repertoire()
+        # Syncing walks the whole repertoire, so run it off the UI thread. Training
+        # controls stay disabled meanwhile since the SRS cards are being updated.
+        self._status_before_sync = self.statusBar().currentMessage()
+        self.statusBar().showMessage("Syncing…")
+        self.centralWidget().setEnabled(False)
+        self.import_action.setEnabled(False)
+        self.show_stats_action.setEnabled(False)
+        task = SyncTask(self.trainer)
+        task.signals.finished.connect(self._on_sync_finished)
+        self._sync_task = task
+        # A pending debounced save would read the cards while the worker mutates them;
+        # _on_sync_finished restarts the timer.
+        self._save_timer.stop()
+        QThreadPool.globalInstance().start(task)
+
+    def _on_sync_finished(self) -> None:
+        self._sync_task = None
+        self.centralWidget().setEnabled(True)
+        self.import_action.setEnabled(True)
+        self.show_stats_action.setEnabled(True)
+        self.statusBar().showMessage(self._status_before_sync)
+        # No-op unless an import or a legacy-file migration changed the repertoire
         self.repertoire.save()
-        self.srs.save()
-        self._latest_stats = self.srs.statistics()
+        self._save_timer.start()
+        self._stats_dirty = True
         self.load_next_card()
 
     def import_pgn(self) -> None:
@@ -164,7 +224,6 @@ class MainWindow(QMainWindow):
         self.refresh_state()
 
     def _ask_side_dialog(self, prompt: str):
-        from PyQt5.QtWidgets import QInputDialog
         sides = ["white", "black"]
         side, ok = QInputDialog.getItem(self, "Select Side", prompt, sides, 0, False)
         return side, ok
@@ -174,22 +233,23 @@ class MainWindow(QMainWindow):
         if not filename:
             return
         try:
-            data = json.dumps(self.repertoire.tree, indent=2, sort_keys=True)
-            Path(filename).write_text(data, encoding="utf-8")
-            QMessageBox.information(self, "Export Complete", f"Repertoire exported to {filename}")
+            # save_json encodes with orjson straight to bytes when available
+            data = {"white": self.repertoire.white_tree, "black": self.repertoire.black_tree}
+            save_json(Path(filename), data)
+            self.statusBar().showMessage(f"Repertoire exported to {filename}", 5000)
         except Exception as exc:  # noqa: BLE001 - show error to user
             QMessageBox.critical(self, "Export Error", f"Failed to export repertoire: {exc}")
 
     def show_statistics(self) -> None:
-        stats = self.srs.statistics()
-        dialog = StatsDialog(self.srs.all_cards().values(), stats, self)
+        stats = self._refresh_stats_if_dirty()
+        cards = list(self.srs.all_cards().values())
+        dialog = StatsDialog(cards, stats, self)
         dialog.exec_()
 
     def load_next_card(self) -> None:
+        self._refresh_stats_if_dirty()
         card = self.trainer.next_card(self.training_side)
         self.current_card = card
-        self._latest_stats = self.srs.statistics()
-        self._update_summary_labels()
         # Flip board if training side is black
         self.board.set_flipped(self.training_side == "black")
         if card is None:
@@ -234,11 +294,12 @@ class MainWindow(QMainWindow):
             return
         self.trainer.record_manual_grade(self.current_card.fen, grade=5)
         self.last_feedback_label.setText("Marked as correct.")
-        self.srs.save()
+        self._save_timer.start()
+        self._stats_dirty = True
         self.load_next_card()
 
     def _handle_training_result(self, result, override_message: Optional[str] = None) -> None:
-        expected_moves = ", ".join(result.expected_moves.keys()) if result.expected_moves else "(none)"
+        expected_moves = ", ".join(result.expected_moves) if result.expected_moves else "(none)"
         message = override_message or result.message
         if result.success:
             detail = f"Expected: {expected_moves}. You played: {result.provided_move}."
@@ -246,16 +307,20 @@ class MainWindow(QMainWindow):
             provided = result.provided_move or "(invalid move)"
             detail = f"Expected: {expected_moves}. You played: {provided}."
         self.last_feedback_label.setText(f"{message}\n{detail}")
-        self.srs.save()
-        if result.next_fen:
-            self.trainer.sync_with_repertoire()
-        self._latest_stats = self.srs.statistics()
+        # grade_answer only schedules the card when it could read a move
+        if result.provided_move is not None:
+            self._save_timer.start()
+            self._stats_dirty = True
         # Only advance if not an illegal move
         if message != "Illegal move. Please try again.":
             self.load_next_card()
 
-    def _update_summary_labels(self) -> None:
-        stats = self._latest_stats
+    def _refresh_stats_if_dirty(self) -> SRSManager.Stats:
+        """Recompute statistics and the summary label only if SRS state changed."""
+        if not self._stats_dirty and self._latest_stats is not None:
+            return self._latest_stats
+        stats = self._latest_stats = self.srs.statistics()
+        self._stats_dirty = False
         self.due_label.setText(
             (
                 f"Due today: {stats.due_today}"
@@ -263,7 +328,11 @@ class MainWindow(QMainWindow):
                 f" | Next {stats.horizon_days} days: {stats.due_within_horizon}"
             )
         )
+        return stats
 
     def closeEvent(self, event) -> None:  # noqa: N802 - PyQt API
+        # Let a running sync finish so the saved state is consistent
+        QThreadPool.globalInstance().waitForDone()
+        self._save_timer.stop()
         self.srs.save()
         super().closeEvent(event)
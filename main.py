@@ -5,15 +5,17 @@ import argparse
 import sys
 from pathlib import Path
 
-from PyQt5.QtWidgets import QApplication
-
 from core.repertoire import RepertoireManager
 from core.srs import SRSManager
 from core.trainer import Trainer
-from gui.main_window import MainWindow
 
 
 def main(argv: list[str] | None = None) -> int:
+    # Qt is imported here so importing this module (e.g. from tooling) stays cheap
+    from PyQt5.QtWidgets import QApplication
+
+    from gui.main_window import MainWindow
+
     parser = argparse.ArgumentParser(description="Chess Opening Trainer")
     # Use a persistent data directory in the user's home folder
     default_data_dir = Path.home() / "ChessOpeningTrainerData"
@@ -37,8 +39,8 @@ def main(argv: list[str] | None = None) -> int:
     srs_manager = SRSManager(srs_path)
     srs_manager.load()
 
+    # MainWindow syncs the trainer with the repertoire in the background on startup
     trainer = Trainer(repertoire, srs_manager)
-    trainer.sync_with_repertoire()
 
     app = QApplication(sys.argv)
     window = MainWindow(srs_manager, trainer, data_dir)
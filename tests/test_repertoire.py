@@ -0,0 +1,64 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import chess
+
+from core.repertoire import SCHEMA_KEY, SCHEMA_VERSION, RepertoireManager, position_key
+
+
+def _key(*sans: str) -> str:
+    board = chess.Board()
+    for san in sans:
+        board.push_san(san)
+    return position_key(board.fen())
+
+
+class ImportPgnTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        tmp = Path(self._tmp.name)
+        self.manager = RepertoireManager(tmp / "white.json", tmp / "black.json")
+
+    def test_illegal_move_does_not_abort_following_games(self) -> None:
+        pgn = '[Event "a"]\n\n1. e4 e5 2. Ke3 *\n\n[Event "b"]\n\n1. d4 d5 *\n'
+        with self.assertLogs("core.repertoire", "ERROR"):
+            count = self.manager.import_pgn_white(io.StringIO(pgn))
+        self.assertEqual(count, 2)
+        self.assertEqual(set(self.manager.white_tree[_key()]), {"e4", "d4"})
+
+    def test_illegal_move_in_variation_records_no_bogus_positions(self) -> None:
+        pgn = "1. e4 e5 (1... c5 2. Qxh7 Nc6) 2. Nf3 Nc6 3. Bb5 *\n"
+        with self.assertLogs("core.repertoire", "ERROR"):
+            self.manager.import_pgn_white(io.StringIO(pgn))
+        tree = self.manager.white_tree
+        self.assertEqual(tree[_key()], {"e4": _key("e4")})
+        # Everything recorded must be reachable from the start position
+        reachable = {_key()}
+        for node in tree.values():
+            reachable.update(node.values())
+        self.assertLessEqual(set(tree), reachable)
+        self.assertNotIn(_key("e4", "c5"), tree)
+
+
+class LoadTest(unittest.TestCase):
+    def test_legacy_file_is_rewritten_tagged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            white_path = Path(tmp) / "white.json"
+            start = chess.Board()
+            after = start.copy()
+            after.push_san("e4")
+            white_path.write_text(json.dumps({start.fen(): {"e4": after.fen()}}), encoding="utf-8")
+            manager = RepertoireManager(white_path, Path(tmp) / "black.json")
+            manager.load()
+            manager.save()
+            data = json.loads(white_path.read_text(encoding="utf-8"))
+        self.assertEqual(data[SCHEMA_KEY], SCHEMA_VERSION)
+        self.assertEqual(data["tree"], {_key(): {"e4": _key("e4")}})
+
+
+if __name__ == "__main__":
+    unittest.main()